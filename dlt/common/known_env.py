@@ -18,6 +18,9 @@ DLT_DEFAULT_NAMING_MODULE = "DLT_DEFAULT_NAMING_MODULE"
 DLT_DLT_ID_LENGTH_BYTES = "DLT_DLT_ID_LENGTH_BYTES"
 """The length of the _dlt_id identifier, before base64 encoding"""
 
+DLT_DLT_ID_HASH = "DLT_DLT_ID_HASH"
+"""Hash function used to compute deterministic _dlt_id: shake128 (default) or blake3"""
+
 DLT_USE_JSON = "DLT_USE_JSON"
 """Type of json parser to use, defaults to orjson, may be simplejson"""
 
@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from dlt.common.exceptions import DltException
 
 
@@ -13,3 +15,14 @@ class InvalidJsonNormalizer(NormalizerException):
             f"Operation requires {required_normalizer} normalizer while"
             f" {present_normalizer} normalizer is present"
         )
+
+
+class UnknownDltIdHashFunction(NormalizerException):
+    def __init__(self, env_var: str, hash_fun_name: str, available: Sequence[str]) -> None:
+        self.env_var = env_var
+        self.hash_fun_name = hash_fun_name
+        self.available = available
+        super().__init__(
+            f"Hash function {hash_fun_name} set in {env_var} is not known. Use one of:"
+            f" {', '.join(available)}"
+        )
@@ -1,16 +1,16 @@
 from functools import lru_cache
-from typing import Dict, List, Mapping, Optional, Sequence, Tuple, cast, TypedDict, Any
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, cast, TypedDict, Any
 from dlt.common.json import json
 from dlt.common.normalizers.exceptions import InvalidJsonNormalizer
 from dlt.common.normalizers.typing import TJSONNormalizer, TRowIdType
-from dlt.common.normalizers.utils import generate_dlt_id, DLT_ID_LENGTH_BYTES
+from dlt.common.normalizers.utils import generate_dlt_id, DLT_ID_LENGTH_BYTES, DLT_ID_HASH_FUN
 
-from dlt.common.typing import DictStrAny, TDataItem, StrAny
+from dlt.common.typing import DictStrAny, TDataItem
 from dlt.common.schema import Schema
 from dlt.common.schema.typing import (
     TLoaderMergeStrategy,
-    TColumnSchema,
     TColumnName,
+    TTableSchemaColumns,
     TSimpleRegex,
     DLT_NAME_PREFIX,
 )
@@ -22,7 +22,7 @@ from dlt.common.schema.utils import (
     get_merge_strategy,
 )
 from dlt.common.schema.exceptions import ColumnNameConflictException
-from dlt.common.utils import digest128, update_dict_nested
+from dlt.common.utils import digest128b, digest128_prefix, digest128_suffix, update_dict_nested
 from dlt.common.normalizers.json import (
     TNormalizedRowIterator,
     wrap_in_dict,
@@ -42,6 +42,22 @@ class RelationalNormalizerConfig(TypedDict, total=False):
     propagation: Optional[RelationalNormalizerConfigPropagation]
 
 
+# pairs of (column, propagated as) resolved from propagation config of a table
+TPropagationPairs = Tuple[Tuple[TColumnName, TColumnName], ...]
+# list being normalized: enumerated elements, ident path, parent path, parent row id, nesting level,
+# table name, parent table name and propagation pairs of the child table
+TListFrame = Tuple[
+    Iterator[Tuple[int, Any]],
+    Tuple[str, ...],
+    Tuple[str, ...],
+    str,
+    int,
+    str,
+    str,
+    TPropagationPairs,
+]
+
+
 class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
     # known normalizer props
     C_DLT_ID = "_dlt_id"
@@ -64,6 +80,10 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
     propagation_config: RelationalNormalizerConfigPropagation
     max_nesting: int
     _skip_primary_key: Dict[str, bool]
+    _normalized_keys: Dict[str, str]
+    _flattened_names: Dict[Tuple[Tuple[str, ...], str], str]
+    _table_names: Dict[Tuple[str, ...], str]
+    _root_table_names: Dict[str, str]
 
     def __init__(self, schema: Schema) -> None:
         """This item normalizer works with nested dictionaries. It flattens dictionaries and descends into lists.
@@ -95,31 +115,29 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
         self.propagation_config = self.normalizer_config.get("propagation", None)
         self.max_nesting = self.normalizer_config.get("max_nesting", 1000)
         self._skip_primary_key = {}
+        # maps data keys into normalized column identifiers, rows typically share the same keys
+        self._normalized_keys = {}
+        # maps paths of normalized identifiers into flattened column names
+        self._flattened_names = {}
+        # maps paths of normalized identifiers into table names
+        self._table_names = {}
+        # maps table names of data items into normalized root table names
+        self._root_table_names = {}
         # self.known_types: Dict[str, TDataType] = {}
         # self.primary_keys = Dict[str, ]
 
-    # for those paths the complex nested objects should be left in place
-    def _is_complex_type(self, table_name: str, field_name: str, _r_lvl: int) -> bool:
-        # turn everything at the recursion level into complex type
-        max_nesting = self.max_nesting
-        schema = self.schema
-        max_table_nesting = self._get_table_nesting_level(schema, table_name)
+    def _get_max_nesting(self, table_name: str) -> int:
+        max_table_nesting = self._get_table_nesting_level(self.schema, table_name)
         if max_table_nesting is not None:
-            max_nesting = max_table_nesting
+            return max_table_nesting
+        return self.max_nesting
 
-        assert _r_lvl <= max_nesting
-        if _r_lvl == max_nesting:
-            return True
-
-        # use cached value
-        # path = f"{table_name}▶{field_name}"
-        # or use definition in the schema
-        column: TColumnSchema = None
-        table = schema.tables.get(table_name)
-        if table:
-            column = table["columns"].get(field_name)
+    # for those paths the complex nested objects should be left in place
+    def _is_complex_type(self, table_columns: TTableSchemaColumns, field_name: str) -> bool:
+        # use definition in the schema
+        column = table_columns.get(field_name)
         if column is None or "data_type" not in column:
-            data_type = schema.get_preferred_type(field_name)
+            data_type = self.schema.get_preferred_type(field_name)
         else:
             data_type = column["data_type"]
 
@@ -131,26 +149,44 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
         out_rec_row: DictStrAny = {}
         out_rec_list: Dict[Tuple[str, ...], Sequence[Any]] = {}
         schema_naming = self.schema.naming
-
-        def norm_row_dicts(dict_row: StrAny, __r_lvl: int, path: Tuple[str, ...] = ()) -> None:
-            for k, v in dict_row.items():
-                if k.strip():
-                    norm_k = schema_naming.normalize_identifier(k)
+        normalized_keys = self._normalized_keys
+        flattened_names = self._flattened_names
+        # resolve table level settings once for all the fields
+        max_nesting = self._get_max_nesting(table)
+        table_schema = self.schema.tables.get(table)
+        table_columns: TTableSchemaColumns = table_schema["columns"] if table_schema else {}
+
+        # walk nested dicts with an explicit stack of item iterators instead of recursion.
+        # stacking iterators (and not dicts) preserves the depth-first order of flattened keys
+        stack: List[Tuple[Iterator[Tuple[str, Any]], int, Tuple[str, ...]]] = [
+            (iter(dict_row.items()), _r_lvl, ())
+        ]
+        while stack:
+            items, __r_lvl, path = stack[-1]
+            for k, v in items:
+                norm_k = normalized_keys.get(k)
+                if norm_k is None:
+                    norm_k = normalized_keys[k] = self._normalize_key(k)
+                if path == ():
+                    child_name = norm_k
                 else:
-                    # for empty keys in the data use _
-                    norm_k = self.EMPTY_KEY_IDENTIFIER
-                # if norm_k != k:
-                #     print(f"{k} -> {norm_k}")
-                child_name = (
-                    norm_k if path == () else schema_naming.shorten_fragments(*path, norm_k)
-                )
+                    child_name = flattened_names.get((path, norm_k))
+                    if child_name is None:
+                        child_name = flattened_names[(path, norm_k)] = (
+                            schema_naming.shorten_fragments(*path, norm_k)
+                        )
                 # for lists and dicts we must check if type is possibly complex
                 if isinstance(v, (dict, list)):
-                    if not self._is_complex_type(table, child_name, __r_lvl):
+                    assert __r_lvl <= max_nesting
+                    # turn everything at the max nesting level into complex type
+                    if __r_lvl < max_nesting and not self._is_complex_type(
+                        table_columns, child_name
+                    ):
                         # TODO: if schema contains table {table}__{child_name} then convert v into single element list
                         if isinstance(v, dict):
-                            # flatten the dict more
-                            norm_row_dicts(v, __r_lvl + 1, path + (norm_k,))
+                            # flatten the dict more, continue with current items when it is done
+                            stack.append((iter(v.items()), __r_lvl + 1, path + (norm_k,)))
+                            break
                         else:
                             # pass the list to out_rec_list
                             out_rec_list[path + (schema_naming.normalize_table_identifier(k),)] = v
@@ -160,10 +196,27 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
                         pass
 
                 out_rec_row[child_name] = v
+            else:
+                # all items consumed
+                stack.pop()
 
-        norm_row_dicts(dict_row, _r_lvl)
         return out_rec_row, out_rec_list
 
+    def _get_table_name(self, path: Tuple[str, ...]) -> str:
+        """Gets (shortened) table name for a path of normalized identifiers. The same path always
+        gets the same str instance"""
+        try:
+            return self._table_names[path]
+        except KeyError:
+            table_name = self._table_names[path] = self.schema.naming.shorten_fragments(*path)
+            return table_name
+
+    def _normalize_key(self, key: str) -> str:
+        if key.strip():
+            return self.schema.naming.normalize_identifier(key)
+        # for empty keys in the data use _
+        return self.EMPTY_KEY_IDENTIFIER
+
     @staticmethod
     def get_row_hash(row: Dict[str, Any], subset: Optional[List[str]] = None) -> str:
         """Returns hash of row.
@@ -172,17 +225,32 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
         Excludes dlt system columns.
         Can be used as deterministic row identifier.
         """
-        row_filtered = {k: v for k, v in row.items() if not k.startswith(DLT_NAME_PREFIX)}
         if subset is not None:
             row_filtered = {k: v for k, v in row.items() if k in subset}
-        row_str = json.dumps(row_filtered, sort_keys=True)
-        return digest128(row_str, DLT_ID_LENGTH_BYTES)
+        else:
+            row_filtered = {k: v for k, v in row.items() if not k.startswith(DLT_NAME_PREFIX)}
+        # hash serialized bytes directly, without decoding into and encoding from str
+        row_bytes = json.dumpb(row_filtered, sort_keys=True)
+        return digest128b(row_bytes, DLT_ID_LENGTH_BYTES, DLT_ID_HASH_FUN)
 
     @staticmethod
     def _get_child_row_hash(parent_row_id: str, child_table: str, list_idx: int) -> str:
         # create deterministic unique id of the child row taking into account that all lists are ordered
         # and all child tables must be lists
-        return digest128(f"{parent_row_id}_{child_table}_{list_idx}", DLT_ID_LENGTH_BYTES)
+        return digest128b(
+            f"{parent_row_id}_{child_table}_{list_idx}".encode("utf-8"),
+            DLT_ID_LENGTH_BYTES,
+            DLT_ID_HASH_FUN,
+        )
+
+    @staticmethod
+    def _get_child_row_hash_prefix(parent_row_id: str, child_table: str) -> Any:
+        """Hashes the part of child row hash shared by all elements of a list. See `_get_child_row_hash`"""
+        return digest128_prefix(f"{parent_row_id}_{child_table}_", DLT_ID_HASH_FUN)
+
+    @staticmethod
+    def _get_child_row_hash_from_prefix(hash_prefix: Any, list_idx: int) -> str:
+        return digest128_suffix(hash_prefix, str(list_idx), DLT_ID_LENGTH_BYTES)
 
     @staticmethod
     def _link_row(row: DictStrAny, parent_row_id: str, list_idx: int) -> DictStrAny:
@@ -196,6 +264,20 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
     def _extend_row(extend: DictStrAny, row: DictStrAny) -> None:
         row.update(extend)
 
+    def _skip_primary_key_check(self, table_name: str) -> bool:
+        """Tells if rows of `table_name` cannot have a primary key: there are no primary key hints
+        and no primary key columns in the table so the rows do not need to be checked"""
+        if self.schema._compiled_hints.get("primary_key"):
+            return False
+        skip = self._skip_primary_key.get(table_name)
+        if skip is None:
+            table = self.schema.tables.get(table_name)
+            skip = not table or not get_columns_names_with_prop(
+                table, "primary_key", include_incomplete=True
+            )
+            self._skip_primary_key[table_name] = skip
+        return skip
+
     def _add_row_id(
         self,
         table: str,
@@ -206,7 +288,7 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
         _r_lvl: int,
     ) -> str:
         primary_key = False
-        if _r_lvl > 0:  # child table
+        if _r_lvl > 0 and not self._skip_primary_key_check(table):  # child table
             primary_key = bool(
                 self.schema.filter_row_with_hint(table, "primary_key", flattened_row)
             )
@@ -232,62 +314,50 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
         flattened_row[self.c_dlt_id] = row_id
         return row_id
 
-    def _get_propagated_values(self, table: str, row: DictStrAny, _r_lvl: int) -> StrAny:
-        extend: DictStrAny = {}
-
-        config = self.propagation_config
-        if config:
-            # mapping(k:v): propagate property with name "k" as property with name "v" in child table
-            mappings: Dict[TColumnName, TColumnName] = {}
-            if _r_lvl == 0:
-                mappings.update(config.get("root") or {})
-            if table in (config.get("tables") or {}):
-                mappings.update(config["tables"][table])
-            # look for keys and create propagation as values
-            for prop_from, prop_as in mappings.items():
-                if prop_from in row:
-                    extend[prop_as] = row[prop_from]
-
-        return extend
-
-    # generate child tables only for lists
-    def _normalize_list(
+    def _get_propagation_pairs(self, table: str, _r_lvl: int) -> TPropagationPairs:
+        # mapping(k:v): propagate property with name "k" as property with name "v" in child table
+        # config may be modified in place between items so it is resolved on each call
+        propagation_config = self.propagation_config
+        if not propagation_config:
+            return ()
+        mappings = (propagation_config.get("tables") or {}).get(table)
+        if _r_lvl == 0:
+            root_mappings = propagation_config.get("root")
+            if root_mappings:
+                mappings = {**root_mappings, **mappings} if mappings else root_mappings
+        return tuple(mappings.items()) if mappings else ()
+
+    @staticmethod
+    def _propagate_values(extend: DictStrAny, row: DictStrAny, pairs: TPropagationPairs) -> None:
+        # look for keys and create propagation as values
+        for prop_from, prop_as in pairs:
+            if prop_from in row:
+                extend[prop_as] = row[prop_from]
+
+    def _push_lists(
         self,
-        seq: Sequence[Any],
-        extend: DictStrAny,
-        ident_path: Tuple[str, ...],
+        stack: List[TListFrame],
+        lists: Dict[Tuple[str, ...], Sequence[Any]],
         parent_path: Tuple[str, ...],
-        parent_row_id: Optional[str] = None,
-        _r_lvl: int = 0,
-    ) -> TNormalizedRowIterator:
-        v: DictStrAny = None
-        table = self.schema.naming.shorten_fragments(*parent_path, *ident_path)
-
-        for idx, v in enumerate(seq):
-            # yield child table row
-            if isinstance(v, dict):
-                yield from self._normalize_row(
-                    v, extend, ident_path, parent_path, parent_row_id, idx, _r_lvl
-                )
-            elif isinstance(v, list):
-                # to normalize lists of lists, we must create a tracking intermediary table by creating a mock row
-                yield from self._normalize_row(
-                    {"list": v},
-                    extend,
+        parent_table: str,
+        parent_row_id: str,
+        _r_lvl: int,
+    ) -> None:
+        # push in reverse so lists are normalized in order of appearance
+        for ident_path, seq in reversed(lists.items()):
+            table = self._get_table_name(parent_path + ident_path)
+            stack.append(
+                (
+                    enumerate(seq),
                     ident_path,
                     parent_path,
                     parent_row_id,
-                    idx,
-                    _r_lvl + 1,
+                    _r_lvl,
+                    table,
+                    parent_table,
+                    self._get_propagation_pairs(table, _r_lvl),
                 )
-            else:
-                # list of simple types
-                child_row_hash = DataItemNormalizer._get_child_row_hash(parent_row_id, table, idx)
-                wrap_v = wrap_in_dict(v)
-                wrap_v[self.c_dlt_id] = child_row_hash
-                e = DataItemNormalizer._link_row(wrap_v, parent_row_id, idx)
-                DataItemNormalizer._extend_row(extend, e)
-                yield (table, self.schema.naming.shorten_fragments(*parent_path)), e
+            )
 
     def _normalize_row(
         self,
@@ -299,38 +369,81 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
         pos: Optional[int] = None,
         _r_lvl: int = 0,
     ) -> TNormalizedRowIterator:
-        schema = self.schema
-        table = schema.naming.shorten_fragments(*parent_path, *ident_path)
-        # flatten current row and extract all lists to recur into
-        flattened_row, lists = self._flatten(table, dict_row, _r_lvl)
-        # always extend row
-        DataItemNormalizer._extend_row(extend, flattened_row)
-        # infer record hash or leave existing primary key if present
-        row_id = flattened_row.get(self.c_dlt_id, None)
-        if not row_id:
-            row_id = self._add_row_id(table, dict_row, flattened_row, parent_row_id, pos, _r_lvl)
-
-        # find fields to propagate to child tables in config
-        extend.update(self._get_propagated_values(table, flattened_row, _r_lvl))
-
-        # yield parent table first
-        should_descend = yield (
-            (table, schema.naming.shorten_fragments(*parent_path)),
-            flattened_row,
-        )
-        if should_descend is False:
-            return
-
-        # normalize and yield lists
-        for list_path, list_content in lists.items():
-            yield from self._normalize_list(
-                list_content,
-                extend,
-                list_path,
-                parent_path + ident_path,
-                row_id,
-                _r_lvl + 1,
-            )
+        # lists to normalize are kept on explicit stack so rows at all nesting levels are yielded
+        # directly from this generator and not through a chain of nested generators
+        stack: List[TListFrame] = []
+        # rows taken from lists reuse table names and propagation computed once per list
+        table = self._get_table_name(parent_path + ident_path)
+        parent_table = self._get_table_name(parent_path)
+        propagation_pairs = self._get_propagation_pairs(table, _r_lvl)
+        while True:
+            # flatten current row and extract all lists to recur into
+            flattened_row, lists = self._flatten(table, dict_row, _r_lvl)
+            # always extend row
+            DataItemNormalizer._extend_row(extend, flattened_row)
+            # infer record hash or leave existing primary key if present
+            row_id = flattened_row.get(self.c_dlt_id, None)
+            if not row_id:
+                row_id = self._add_row_id(
+                    table, dict_row, flattened_row, parent_row_id, pos, _r_lvl
+                )
+
+            # find fields to propagate to child tables in config
+            if propagation_pairs:
+                DataItemNormalizer._propagate_values(extend, flattened_row, propagation_pairs)
+
+            # yield parent table first
+            should_descend = yield (table, parent_table), flattened_row
+            if should_descend is not False and lists:
+                self._push_lists(stack, lists, parent_path + ident_path, table, row_id, _r_lvl + 1)
+
+            # take next row from the lists, yield lists of simple types on the way
+            dict_row = None
+            while stack and dict_row is None:
+                (
+                    elements,
+                    ident_path,
+                    parent_path,
+                    parent_row_id,
+                    _r_lvl,
+                    table,
+                    parent_table,
+                    propagation_pairs,
+                ) = stack[-1]
+                # elements of lists of simple types share parent row id and table so that part
+                # of their row hash is computed once, on first element that needs it
+                child_hash_prefix = None
+                for pos, v in elements:
+                    # yield child table row
+                    if isinstance(v, dict):
+                        dict_row = v
+                        break
+                    elif isinstance(v, list):
+                        # to normalize lists of lists, we must create a tracking intermediary table by creating a mock row
+                        dict_row = {"list": v}
+                        _r_lvl += 1
+                        break
+                    else:
+                        # list of simple types, same columns as wrap_in_dict + _link_row
+                        if child_hash_prefix is None:
+                            child_hash_prefix = DataItemNormalizer._get_child_row_hash_prefix(
+                                parent_row_id, table
+                            )
+                        e = {
+                            self.C_VALUE: v,
+                            self.c_dlt_id: DataItemNormalizer._get_child_row_hash_from_prefix(
+                                child_hash_prefix, pos
+                            ),
+                            self.C_DLT_PARENT_ID: parent_row_id,
+                            self.C_DLT_LIST_IDX: pos,
+                        }
+                        DataItemNormalizer._extend_row(extend, e)
+                        yield (table, parent_table), e
+                else:
+                    # all elements normalized
+                    stack.pop()
+            if dict_row is None:
+                return
 
     def extend_schema(self) -> None:
         """Extends Schema with normalizer-specific hints and settings.
@@ -369,6 +482,8 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
         Called by Schema when new table is added to schema or table is updated with partial table.
         Table name should be normalized.
         """
+        # columns may have changed
+        self._skip_primary_key.pop(table_name, None)
         table = self.schema.tables.get(table_name)
         if not table.get("parent") and table.get("write_disposition") == "merge":
             DataItemNormalizer.update_normalizer_config(
@@ -399,11 +514,16 @@ class DataItemNormalizer(DataItemNormalizerBase[RelationalNormalizerConfig]):
                 self.schema.name, self._get_validity_column_names(self.schema, table_name), item
             )
 
-        yield from self._normalize_row(
-            row,
-            {},
-            (self.schema.naming.normalize_table_identifier(table_name),),
-        )
+        yield from self._normalize_row(row, {}, (self._normalize_root_table_name(table_name),))
+
+    def _normalize_root_table_name(self, table_name: str) -> str:
+        try:
+            return self._root_table_names[table_name]
+        except KeyError:
+            root_table_name = self._root_table_names[table_name] = (
+                self.schema.naming.normalize_table_identifier(table_name)
+            )
+            return root_table_name
 
     @classmethod
     def ensure_this_normalizer(cls, norm_config: TJSONNormalizer) -> None:
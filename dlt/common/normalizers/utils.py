@@ -1,16 +1,19 @@
 import os
+import hashlib
 from importlib import import_module
 from types import ModuleType
-from typing import Any, Dict, Optional, Type, Tuple, cast, List
+from typing import Any, Callable, Dict, Optional, Type, Tuple, cast, List
 
 import dlt
 from dlt.common import logger
+from dlt import version
 from dlt.common import known_env
 from dlt.common.configuration.inject import with_config
 from dlt.common.configuration.specs import known_sections
 from dlt.common.destination import DestinationCapabilitiesContext
+from dlt.common.exceptions import MissingDependencyException
 from dlt.common.normalizers.configuration import NormalizersConfiguration
-from dlt.common.normalizers.exceptions import InvalidJsonNormalizer
+from dlt.common.normalizers.exceptions import InvalidJsonNormalizer, UnknownDltIdHashFunction
 from dlt.common.normalizers.json import SupportsDataItemNormalizer, DataItemNormalizer
 from dlt.common.normalizers.naming import NamingConvention
 from dlt.common.normalizers.naming.exceptions import (
@@ -32,6 +35,24 @@ DEFAULT_NAMING_NAMESPACE = os.environ.get(
 DEFAULT_NAMING_MODULE = os.environ.get(known_env.DLT_DEFAULT_NAMING_MODULE, "snake_case")
 DLT_ID_LENGTH_BYTES = int(os.environ.get(known_env.DLT_DLT_ID_LENGTH_BYTES, 10))
 
+# pick hash function for deterministic _dlt_id, changing it changes all the ids
+DLT_ID_HASH_FUNS = ("shake128", "blake3")
+DLT_ID_HASH_FUN: Callable[[bytes], Any] = hashlib.shake_128
+_dlt_id_hash = os.environ.get(known_env.DLT_DLT_ID_HASH) or "shake128"
+if _dlt_id_hash not in DLT_ID_HASH_FUNS:
+    raise UnknownDltIdHashFunction(known_env.DLT_DLT_ID_HASH, _dlt_id_hash, DLT_ID_HASH_FUNS)
+if _dlt_id_hash == "blake3":
+    try:
+        from blake3 import blake3
+
+        DLT_ID_HASH_FUN = blake3
+    except ModuleNotFoundError:
+        raise MissingDependencyException(
+            "BLAKE3 _dlt_id hashing",
+            [f"{version.DLT_PKG_NAME}[blake3]"],
+            f"Install `blake3` or unset {known_env.DLT_DLT_ID_HASH} to use default shake128.",
+        )
+
 
 def _section_for_schema(kwargs: Dict[str, Any]) -> Tuple[str, ...]:
     """Uses the schema name to generate dynamic section normalizer settings"""
@@ -98,6 +98,8 @@ class Schema:
 
     # list of preferred types: map regex on columns into types
     _compiled_preferred_types: List[Tuple[REPattern, TDataType]]
+    # preferred types resolved for column names, reset when settings are compiled
+    _preferred_types_cache: Dict[str, Optional[TDataType]]
     # compiled default hints
     _compiled_hints: Dict[TColumnHint, Sequence[REPattern]]
     # compiled exclude filters per table
@@ -587,7 +589,14 @@ class Schema:
         return [t["name"] for t in self.dlt_tables()]
 
     def get_preferred_type(self, col_name: str) -> Optional[TDataType]:
-        return next((m[1] for m in self._compiled_preferred_types if m[0].search(col_name)), None)
+        try:
+            return self._preferred_types_cache[col_name]
+        except KeyError:
+            preferred_type = next(
+                (m[1] for m in self._compiled_preferred_types if m[0].search(col_name)), None
+            )
+            self._preferred_types_cache[col_name] = preferred_type
+            return preferred_type
 
     def is_new_table(self, table_name: str) -> bool:
         """Returns true if this table does not exist OR is incomplete (has only incomplete columns) and therefore new"""
@@ -1136,6 +1145,7 @@ class Schema:
 
         self._settings: TSchemaSettings = {}
         self._compiled_preferred_types: List[Tuple[REPattern, TDataType]] = []
+        self._preferred_types_cache: Dict[str, Optional[TDataType]] = {}
         self._compiled_hints: Dict[TColumnHint, Sequence[REPattern]] = {}
         self._compiled_excludes: Dict[str, Sequence[REPattern]] = {}
         self._compiled_includes: Dict[str, Sequence[REPattern]] = {}
@@ -1183,6 +1193,8 @@ class Schema:
         self._schema_name = name
 
     def _compile_settings(self) -> None:
+        # preferred types may change so drop types resolved for column names
+        self._preferred_types_cache = {}
         # if self._settings:
         for pattern, dt in self._settings.get("preferred_types", {}).items():
             # add tuples to be searched in coercions
@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 import sys
 import base64
+import binascii
 import hashlib
 import secrets
 from contextlib import contextmanager
@@ -81,17 +82,31 @@ def many_uniq_ids_base64(n_ids: int, len_: int = 16) -> List[str]:
 
 def digest128(v: str, len_: int = 15) -> str:
     """Returns a base64 encoded shake128 hash of str `v` with digest of length `len_` (default: 15 bytes = 20 characters length)"""
-    return (
-        base64.b64encode(hashlib.shake_128(v.encode("utf-8")).digest(len_))
-        .decode("ascii")
-        .rstrip("=")
-    )
+    return _b64encode_digest(hashlib.shake_128(v.encode("utf-8")).digest(len_))
 
 
-def digest128b(v: bytes, len_: int = 15) -> str:
-    """Returns a base64 encoded shake128 hash of bytes `v` with digest of length `len_` (default: 15 bytes = 20 characters length)"""
-    enc_v = base64.b64encode(hashlib.shake_128(v).digest(len_)).decode("ascii")
-    return enc_v.rstrip("=")
+def digest128_prefix(prefix: str, hash_fun: Callable[[bytes], Any] = hashlib.shake_128) -> Any:
+    """Returns shake128 (or `hash_fun`) hash state fed with str `prefix`. Use with `digest128_suffix` to hash many strings sharing the same prefix"""
+    return hash_fun(prefix.encode("utf-8"))
+
+
+def digest128_suffix(prefix_state: Any, suffix: str, len_: int = 15) -> str:
+    """Returns `digest128(prefix + suffix, len_)` where `prefix_state` comes from `digest128_prefix(prefix)`. Only `suffix` is hashed."""
+    h = prefix_state.copy()
+    h.update(suffix.encode("utf-8"))
+    return _b64encode_digest(h.digest(len_))
+
+
+def digest128b(
+    v: bytes, len_: int = 15, hash_fun: Callable[[bytes], Any] = hashlib.shake_128
+) -> str:
+    """Returns a base64 encoded shake128 (or `hash_fun`) hash of bytes `v` with digest of length `len_` (default: 15 bytes = 20 characters length)"""
+    return _b64encode_digest(hash_fun(v).digest(len_))
+
+
+def _b64encode_digest(digest: bytes) -> str:
+    # binascii skips the argument checks of base64.b64encode, padding is not included in ids
+    return binascii.b2a_base64(digest, newline=False).decode("ascii").rstrip("=")
 
 
 def digest256(v: str) -> str:
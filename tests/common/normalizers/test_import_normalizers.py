@@ -1,8 +1,12 @@
 import os
+import hashlib
 import pytest
 
+from dlt.common import known_env
+
 from dlt.common.configuration.container import Container
 from dlt.common.destination import DestinationCapabilitiesContext
+from dlt.common.normalizers.exceptions import UnknownDltIdHashFunction
 from dlt.common.normalizers.typing import TNormalizersConfig
 from dlt.common.normalizers.utils import (
     DEFAULT_NAMING_NAMESPACE,
@@ -216,3 +220,27 @@ def test_import_invalid_naming_module() -> None:
         import_normalizers(explicit_normalizers("dlt.pipeline.helpers"))
     assert py_ex2.value.naming_module == "dlt.pipeline"
     assert py_ex2.value.naming_class == "helpers"
+
+
+def test_dlt_id_hash_fun_from_env() -> None:
+    from importlib import reload
+    from dlt.common.normalizers import utils as normalizers_utils
+
+    saved_hash = os.environ.get(known_env.DLT_DLT_ID_HASH)
+    try:
+        os.environ[known_env.DLT_DLT_ID_HASH] = "BLAKE3"
+        with pytest.raises(UnknownDltIdHashFunction) as py_ex:
+            reload(normalizers_utils)
+        assert py_ex.value.hash_fun_name == "BLAKE3"
+        assert py_ex.value.env_var == known_env.DLT_DLT_ID_HASH
+
+        os.environ[known_env.DLT_DLT_ID_HASH] = "shake128"
+        reload(normalizers_utils)
+        assert normalizers_utils.DLT_ID_HASH_FUN is hashlib.shake_128
+    finally:
+        # restore hash function used by the other tests
+        if saved_hash is None:
+            del os.environ[known_env.DLT_DLT_ID_HASH]
+        else:
+            os.environ[known_env.DLT_DLT_ID_HASH] = saved_hash
+        reload(normalizers_utils)
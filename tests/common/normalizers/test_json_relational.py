@@ -1,12 +1,16 @@
+from copy import deepcopy
+import hashlib
 import pytest
 
+from dlt.common.json import json
 from dlt.common.typing import StrAny, DictStrAny
 from dlt.common.normalizers.naming import NamingConvention
 from dlt.common.schema.typing import TColumnName, TSimpleRegex
-from dlt.common.utils import digest128, uniq_id
+from dlt.common.utils import digest128, digest128b, uniq_id
 from dlt.common.schema import Schema
 from dlt.common.schema.utils import new_table
 
+from dlt.common.normalizers.json import relational
 from dlt.common.normalizers.json.relational import (
     RelationalNormalizerConfigPropagation,
     DataItemNormalizer as RelationalNormalizer,
@@ -47,6 +51,19 @@ def test_flatten_fix_field_name(norm: RelationalNormalizer) -> None:
     ) in lists
 
 
+def test_flatten_preserves_order(norm: RelationalNormalizer) -> None:
+    row = {
+        "a": 1,
+        "b": {"c": {"d": 2, "l": [1]}, "e": 3},
+        "f": 4,
+        "g": {"h": {"i": {"j": 5}}, "l": [2]},
+    }
+    flattened_row, lists = norm._flatten("mock_table", row, 0)
+    # nested dicts are flattened depth first, in order of appearance
+    assert list(flattened_row.keys()) == ["a", "b__c__d", "b__e", "f", "g__h__i__j"]
+    assert list(lists.keys()) == [("b", "c", "l"), ("g", "l")]
+
+
 def test_preserve_complex_value(norm: RelationalNormalizer) -> None:
     # add table with complex column
     norm.schema.update_table(
@@ -165,6 +182,32 @@ def test_child_table_linking_primary_key(norm: RelationalNormalizer) -> None:
     assert all(r[0][1] == "table__f" for r in obj_rows)
 
 
+def test_child_table_linking_primary_key_column(norm: RelationalNormalizer) -> None:
+    row = {"id": "level0", "f": [{"id": "level1", "v": 120}]}
+    norm.schema.update_table(new_table("table"))
+    norm.schema.update_table(new_table("table__f", parent_table_name="table"))
+
+    # no primary key on child table: linked to parent with deterministic hash
+    rows = list(norm._normalize_row(row, {}, ("table",)))
+    t_f = next(t for t in rows if t[0][0] == "table__f")[1]
+    assert t_f["_dlt_id"] == RelationalNormalizer._get_child_row_hash(
+        t_f["_dlt_parent_id"], "table__f", 0
+    )
+
+    # add primary key column, without any primary key hints
+    norm.schema.update_table(
+        new_table(
+            "table__f",
+            parent_table_name="table",
+            columns=[{"name": "id", "data_type": "text", "primary_key": True}],
+        )
+    )
+    rows = list(norm._normalize_row(row, {}, ("table",)))
+    t_f = next(t for t in rows if t[0][0] == "table__f")[1]
+    assert "_dlt_parent_id" not in t_f
+    assert "_dlt_list_idx" not in t_f
+
+
 def test_yields_parents_first(norm: RelationalNormalizer) -> None:
     row = {
         "id": "level0",
@@ -186,6 +229,11 @@ def test_yields_parents_first(norm: RelationalNormalizer) -> None:
         "table__g__l",
     ]
     assert expected_tables == tables
+    # table names are not recreated for each row
+    assert rows[2][0][0] is rows[3][0][0] is rows[4][0][0]
+    assert rows[1][0][0] is rows[2][0][1]
+    rows_2 = list(norm._normalize_row(row, {}, ("table",)))
+    assert all(r[0][0] is r_2[0][0] for r, r_2 in zip(rows, rows_2))
 
 
 def test_yields_parent_relation(norm: RelationalNormalizer) -> None:
@@ -312,6 +360,16 @@ def test_list_position(norm: RelationalNormalizer) -> None:
 #     print(rows)
 
 
+def test_normalize_data_item_lazy(norm: RelationalNormalizer) -> None:
+    row = {"a": 1}
+    rows_gen = norm.normalize_data_item(row, "load_id", "table")
+    # item is not modified before first row is requested
+    assert "_dlt_load_id" not in row
+    (table, _), root = next(rows_gen)
+    assert table == "table"
+    assert root["_dlt_load_id"] == "load_id"
+
+
 def test_control_descending(norm: RelationalNormalizer) -> None:
     row: StrAny = {
         "f": [{"l": ["a", "b", "c"], "v": 120, "lo": [[{"e": "a"}, {"e": "b"}, {"e": "c"}]]}],
@@ -437,15 +495,13 @@ def test_child_row_deterministic_hash(norm: RelationalNormalizer) -> None:
 
     # compute hashes for all children
     for (table, _), ch in children:
-        expected_hash = digest128(
-            f"{ch['_dlt_parent_id']}_{table}_{ch['_dlt_list_idx']}", DLT_ID_LENGTH_BYTES
-        )
+        expected_hash = dlt_id_hash(f"{ch['_dlt_parent_id']}_{table}_{ch['_dlt_list_idx']}")
         assert ch["_dlt_id"] == expected_hash
 
     # direct compute one of the
     el_f = next(t[1] for t in rows if t[0][0] == "table__f" and t[1]["_dlt_list_idx"] == 0)
     f_lo_p2 = next(t[1] for t in rows if t[0][0] == "table__f__lo" and t[1]["_dlt_list_idx"] == 2)
-    assert f_lo_p2["_dlt_id"] == digest128(f"{el_f['_dlt_id']}_table__f__lo_2", DLT_ID_LENGTH_BYTES)
+    assert f_lo_p2["_dlt_id"] == dlt_id_hash(f"{el_f['_dlt_id']}_table__f__lo_2")
 
     # same data with same table and row_id
     rows_2 = list(norm._normalize_row(row, {}, ("table",)))
@@ -465,6 +521,38 @@ def test_child_row_deterministic_hash(norm: RelationalNormalizer) -> None:
     assert all(ch[0][1]["_dlt_id"] != ch[1][1]["_dlt_id"] for ch in zip(children, children_3))
 
 
+def test_child_row_hash_fun(norm: RelationalNormalizer, monkeypatch) -> None:
+    blake3 = pytest.importorskip("blake3").blake3
+    row = {"_dlt_id": "###", "id": 1, "f": [{"l": ["a", "b"]}, {"l": ["c"]}]}
+    monkeypatch.setattr(relational, "DLT_ID_HASH_FUN", hashlib.shake_128)
+    rows = list(norm._normalize_row(deepcopy(row), {}, ("table",)))
+    row_hash = RelationalNormalizer.get_row_hash(row)
+
+    monkeypatch.setattr(relational, "DLT_ID_HASH_FUN", blake3)
+    rows_b3 = list(norm._normalize_row(deepcopy(row), {}, ("table",)))
+    # same rows with all child ids hashed with blake3
+    assert [r[0] for r in rows_b3] == [r[0] for r in rows]
+    for (table, _), ch in rows_b3[1:]:
+        assert ch["_dlt_id"] == dlt_id_hash(f"{ch['_dlt_parent_id']}_{table}_{ch['_dlt_list_idx']}")
+    assert all(b[1]["_dlt_id"] != s[1]["_dlt_id"] for b, s in zip(rows_b3[1:], rows[1:]))
+    assert RelationalNormalizer.get_row_hash(row) != row_hash
+
+
+def test_row_hash() -> None:
+    row = {"id": 1, "name": "ąę", "_dlt_load_id": "load_id", "nested": {"b": 2, "a": [1]}}
+    # hash is stable: dlt columns excluded, keys sorted
+    assert RelationalNormalizer.get_row_hash(row) == digest128b(
+        json.dumpb({"id": 1, "name": "ąę", "nested": {"b": 2, "a": [1]}}, sort_keys=True),
+        DLT_ID_LENGTH_BYTES,
+        relational.DLT_ID_HASH_FUN,
+    )
+    assert RelationalNormalizer.get_row_hash(row, subset=["name", "id"]) == digest128b(
+        json.dumpb({"id": 1, "name": "ąę"}, sort_keys=True),
+        DLT_ID_LENGTH_BYTES,
+        relational.DLT_ID_HASH_FUN,
+    )
+
+
 def test_keeps_dlt_id(norm: RelationalNormalizer) -> None:
     h = uniq_id()
     row = {"a": "b", "_dlt_id": h}
@@ -570,6 +658,24 @@ def test_propagates_table_context(
     )
 
 
+def test_propagation_config_change_between_rows(norm: RelationalNormalizer) -> None:
+    add_dlt_root_id_propagation(norm)
+    row = {"_dlt_id": "###", "timestamp": 1.0, "lvl1": [{"vx": "ax", "lvl2": [1]}]}
+    rows = list(norm._normalize_row(deepcopy(row), {}, ("table",)))
+    assert all("_partition_ts" not in r[1] and "__vx" not in r[1] for r in rows)
+
+    # modify propagation config in place, next row must see the change
+    prop_config: RelationalNormalizerConfigPropagation = norm.schema._normalizers_config["json"][
+        "config"
+    ]["propagation"]
+    prop_config["root"][TColumnName("timestamp")] = TColumnName("_partition_ts")
+    prop_config["tables"]["table__lvl1"] = {TColumnName("vx"): TColumnName("__vx")}
+    rows = list(norm._normalize_row(deepcopy(row), {}, ("table",)))
+    non_root = [r for r in rows if r[0][1] is not None]
+    assert all(r[1]["_partition_ts"] == 1.0 for r in non_root)
+    assert [r[1]["__vx"] for r in non_root if r[0][0] == "table__lvl1__lvl2"] == ["ax"]
+
+
 def test_propagates_table_context_to_lists(norm: RelationalNormalizer) -> None:
     add_dlt_root_id_propagation(norm)
     prop_config: RelationalNormalizerConfigPropagation = norm.schema._normalizers_config["json"][
@@ -868,6 +974,11 @@ def test_propagation_update_on_table_change(norm: RelationalNormalizer):
     ] == {"_dlt_id": "_dlt_root_id", "prop1": "prop2"}
 
 
+def dlt_id_hash(v: str) -> str:
+    """Hashes `v` like normalizer does for deterministic _dlt_id"""
+    return digest128b(v.encode("utf-8"), DLT_ID_LENGTH_BYTES, relational.DLT_ID_HASH_FUN)
+
+
 def set_max_nesting(norm: RelationalNormalizer, max_nesting: int) -> None:
     RelationalNormalizer.update_normalizer_config(norm.schema, {"max_nesting": max_nesting})
     norm._reset()
@@ -30,6 +30,16 @@ def test_get_preferred_type(schema: Schema) -> None:
     assert schema.get_preferred_type("_timestamp") is None
 
 
+def test_get_preferred_type_after_update(schema: Schema) -> None:
+    # resolve types before preferred types are added
+    assert schema.get_preferred_type("amount") is None
+    assert schema.get_preferred_type("value") is None
+    schema.update_preferred_types({TSimpleRegex("amount"): "decimal"})
+    # types resolved before the update are not kept
+    assert schema.get_preferred_type("amount") == "decimal"
+    assert schema.get_preferred_type("value") is None
+
+
 def test_map_column_preferred_type(schema: Schema) -> None:
     _add_preferred_types(schema)
     # preferred type match
@@ -12,6 +12,9 @@ from dlt.common.utils import (
     graph_find_scc_nodes,
     flatten_list_of_str_or_dicts,
     digest128,
+    digest128b,
+    digest128_prefix,
+    digest128_suffix,
     graph_edges_to_nodes,
     map_nested_in_place,
     reveal_pseudo_secret,
@@ -39,6 +42,25 @@ def test_flatten_list_of_str_or_dicts() -> None:
 
 def test_digest128_length() -> None:
     assert len(digest128("hash it")) == 120 / 6
+    # 10 bytes digest is base64 encoded without padding
+    assert len(digest128("hash it", 10)) == 14
+    assert digest128("hash it", 10) == digest128b(b"hash it", 10)
+
+
+def test_digest128_prefix_suffix() -> None:
+    prefix = digest128_prefix("parent_table_")
+    for idx in range(3):
+        assert digest128_suffix(prefix, str(idx)) == digest128(f"parent_table_{idx}")
+        assert digest128_suffix(prefix, str(idx), 10) == digest128(f"parent_table_{idx}", 10)
+    # prefix state is not modified
+    assert digest128_suffix(prefix, "") == digest128("parent_table_")
+
+
+def test_digest128_hash_fun() -> None:
+    blake3 = pytest.importorskip("blake3").blake3
+    prefix = digest128_prefix("parent_table_", blake3)
+    assert digest128_suffix(prefix, "1", 10) == digest128b(b"parent_table_1", 10, blake3)
+    assert digest128b(b"parent_table_1", 10, blake3) != digest128b(b"parent_table_1", 10)
 
 
 def test_map_dicts_in_place() -> None: